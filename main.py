@@ -1,19 +1,23 @@
 import asyncio
 import datetime
-import json
+import functools
 import logging
 import argparse
 from urllib.parse import urljoin, quote_plus
 
 import time
-import schedule
 import os
+import tempfile
 from dotenv import load_dotenv
 
+import aiohttp
+import orjson
 import requests
-from bs4 import BeautifulSoup
-from pyppeteer import launch
-from sqlalchemy import create_engine, Column, Integer, String, Text, Boolean, ForeignKey, JSON
+from aiolimiter import AsyncLimiter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
+from sqlalchemy import create_engine, func, insert, select, update, Column, Integer, String, Text, Boolean, ForeignKey, JSON
 from sqlalchemy.dialects.mysql import LONGTEXT
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base
 import mysql.connector
@@ -45,10 +49,15 @@ encoded_password = quote_plus(DB_PASSWORD)
 # Construct the database URL
 DATABASE_URL = f"mysql+mysqlconnector://{DB_USER}:{encoded_password}@{DB_HOST}/{DB_NAME}"
 
+def dump_json(value):
+    # MySQL rejects JSON values sent as binary strings, so hand the driver str instead of bytes
+    return orjson.dumps(value).decode()
+
 # SQLAlchemy setup
 Base = declarative_base()
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(bind=engine)
+engine = create_engine(DATABASE_URL, json_serializer=dump_json, json_deserializer=orjson.loads)
+# The scraper writes in bulk, so skip autoflush and the reload of expired objects after each commit
+Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 class FundingProgram(Base):
     __tablename__ = 'funding_programs'
@@ -86,44 +95,74 @@ Base.metadata.create_all(engine)
 BASE_URL = "https://www.foerderdatenbank.de"
 START_URL = f"{BASE_URL}/SiteGlobals/FDB/Forms/Suche/Foederprogrammsuche_Formular.html?submit=Suchen&filterCategories=FundingProgram&sortOrder=dateOfIssue_dt+asc"
 
-async def get_browser():
-    return await launch(headless=True)
+# Detail pages are fetched concurrently, bounded by these limits
+MAX_CONCURRENT_REQUESTS = 8
+REQUESTS_PER_SECOND = 8
+
+# Index pages are fetched ahead of time and handed to workers that scrape their detail pages
+INDEX_QUEUE_SIZE = 2
+INDEX_PAGE_WORKERS = 2
+
+# Longest single sleep of the weekly scheduler, in seconds
+MAX_SCHEDULER_SLEEP = 3600
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; foerderdatenbank-scraper/0.1)',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# Shared session so index page requests reuse keep-alive connections
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
 
 def get_soup(url):
     try:
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=10)
         response.raise_for_status()
         logger.info(f"Successfully fetched URL: {url}")
-        return BeautifulSoup(response.text, 'html.parser')
+        # Hand the raw bytes to the parser, which detects the encoding from <meta charset>
+        return LexborHTMLParser(response.content, encoding=True)
     except requests.RequestException as e:
         logger.error(f"Error fetching URL {url}: {e}")
         return None
 
-async def get_soup_with_js(page, url):
-    await page.goto(url, waitUntil='networkidle0')
-    content = await page.content()
-    return BeautifulSoup(content, 'html.parser')
+async def fetch_detail(sem, limiter, http, url):
+    try:
+        async with sem, limiter:
+            async with http.get(url) as response:
+                response.raise_for_status()
+                html = await response.read()
+        logger.info(f"Successfully fetched URL: {url}")
+        return html
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching URL {url}: {e}")
+        return None
 
-def extract_program_links(soup):
+def extract_program_links(tree):
     programs = []
-    cards = soup.find_all('div', class_='card--fundingprogram')
-    for card in cards:
-        link = card.find('a', class_='')
+    for card in tree.css('div.card--fundingprogram'):
+        # Same as bs4's find('a', class_=''): a link without a class or with an empty one
+        link = card.css_first('a:not([class]), a[class=""]')
         if link:
-            program_url = urljoin(BASE_URL, link.get('href', ''))
-            program_name = link.find('span', class_='link--label')
-            program_name = program_name.text.strip() if program_name else ''
+            program_url = urljoin(BASE_URL, link.attributes.get('href') or '')
+            program_name = link.css_first('span.link--label')
+            program_name = program_name.text().strip() if program_name else ''
             if program_url and program_name:
                 programs.append((program_url, program_name))
     logger.info(f"Extracted {len(programs)} program links from the page")
     return programs
 
-def get_next_page_url(soup):
-    pagination = soup.find('div', class_='pagination')
-    if pagination:
-        next_button = pagination.find('a', class_='forward button')
-        if next_button and 'href' in next_button.attrs:
-            next_url = urljoin(BASE_URL, next_button['href'])
+def get_next_page_url(tree):
+    next_button = tree.css_first('div.pagination a.forward.button')
+    if next_button:
+        href = next_button.attributes.get('href')
+        if href:
+            next_url = urljoin(BASE_URL, href)
             logger.info(f"Found next page URL: {next_url}")
             return next_url
     logger.info("No next page found")
@@ -131,181 +170,372 @@ def get_next_page_url(soup):
 
 def safe_extract(element, selector, attribute=None):
     try:
-        found = element.select_one(selector)
+        found = element.css_first(selector)
         if found:
             if attribute:
-                return found.get(attribute, '').strip()
+                return (found.attributes.get(attribute) or '').strip()
             else:
-                return found.text.strip()
+                return found.text().strip()
     except Exception as e:
         logger.error(f"Error extracting {selector}: {e}")
     return ''
 
-def extract_contact_info(contact_data):
-    contact_info = {
-        'provider_name': '',
-        'provider_address': '',
-        'provider_phone': '',
-        'provider_fax': '',
-        'provider_email': '',
-        'provider_website': ''
-    }
+def strip_label(text):
+    # "Telefon: 030 123" -> "030 123"
+    _, separator, value = text.partition(':')
+    return value.strip() if separator else text
 
-    contact_info['provider_name'] = safe_extract(contact_data, "p.card--title")
-    contact_info['provider_address'] = safe_extract(contact_data, "div.address")
+def populate_contact_info(contact_data, row):
+    row['provider_name'] = safe_extract(contact_data, "p.card--title")
+    row['provider_address'] = safe_extract(contact_data, "div.address")
 
-    phone = safe_extract(contact_data, "p.tel")
-    contact_info['provider_phone'] = phone.split(':')[1].strip() if ':' in phone else phone
+    row['provider_phone'] = strip_label(safe_extract(contact_data, "p.tel"))
+    row['provider_fax'] = strip_label(safe_extract(contact_data, "p.fax"))
 
-    fax = safe_extract(contact_data, "p.fax")
-    contact_info['provider_fax'] = fax.split(':')[1].strip() if ':' in fax else fax
+    row['provider_email'] = safe_extract(contact_data, "p.email a", "href").removeprefix('mailto:')
+    row['provider_website'] = safe_extract(contact_data, "p.website a", "href")
 
-    contact_info['provider_email'] = safe_extract(contact_data, "p.email a", "href").replace('mailto:', '')
-    contact_info['provider_website'] = safe_extract(contact_data, "p.website a", "href")
+# bs4's get_text() leaves out the contents of these elements
+NON_TEXT_TAGS = {'script', 'style', 'template'}
 
-    return contact_info
+def join_text(element, separator="\n"):
+    # Like bs4's get_text(separator, strip=True): selectolax's own text(strip=True)
+    # keeps whitespace-only text nodes as empty segments
+    texts = (
+        node.text_content.strip()
+        for node in element.traverse(include_text=True)
+        if node.tag == '-text' and node.parent.tag not in NON_TEXT_TAGS
+    )
+    return separator.join(text for text in texts if text)
 
 def extract_links(element):
     links = []
-    for a in element.find_all('a', href=True):
-        links.append(a['href'])
+    for a in element.css('a[href]'):
+        href = a.attributes.get('href')
+        if href:
+            links.append(href)
     return links
 
-def extract_program_details(soup):
-    details = {}
-
-    # Extract program name
-    details['program_name'] = safe_extract(soup, 'h1.title')
-
-    # Extract other details
-    dl = soup.find('dl', class_='grid-modul--two-elements document-info-fundingprogram')
-    if dl:
-        dt_elements = dl.find_all('dt')
-        dd_elements = dl.find_all('dd')
-        for dt, dd in zip(dt_elements, dd_elements):
-            key = dt.text.strip().lower().replace(' ', '_').replace(':', '')
-            if key == 'weiterführende_links':
-                details[key] = extract_links(dd)
-            elif key == 'ansprechpunkt':
-                contact_info = extract_contact_info(dd)
-                details.update(contact_info)
-            else:
-                details[key] = dd.text.strip()
+# Details list and tab articles of a program page, matched in document order
+PROGRAM_DETAILS_SELECTOR = (
+    'dl.grid-modul--two-elements.document-info-fundingprogram, '
+    'article#tab1, article#tab2, article#tab3'
+)
+TAB_COLUMNS = {'tab1': 'short_summary', 'tab2': 'additional_information', 'tab3': 'legal_basis'}
+# Labels of the details list and the program_details column they are stored in
+LABEL_COLUMNS = {
+    'förderart': 'funding_type',
+    'förderbereich': 'support_area',
+    'fördergebiet': 'funding_area',
+    'förderberechtigte': 'eligible',
+    'fördergeber': 'funding_provider',
+}
+DETAILS_ROW_COLUMNS = [column.name for column in ProgramDetails.__table__.columns if column.name not in ('id', 'program_id')]
+
+def populate_details(tree, row):
+    found = set()
+
+    # Walk the document once and write each value straight into its column
+    for node in tree.css(PROGRAM_DETAILS_SELECTOR):
+        section = node.attributes.get('id') if node.tag == 'article' else node.tag
+        if section in found:
+            continue
+        found.add(section)
+
+        if node.tag == 'dl':
+            key = None
+            for item in node.css('dt, dd'):
+                # Pair each dd with the dt preceding it while walking the list once
+                if item.tag == 'dt':
+                    key = item.text().strip().lower().replace(' ', '_').replace(':', '')
+                    continue
+                if key is None:
+                    continue
+                if key == 'weiterführende_links':
+                    # Stored as a JSON-encoded string inside the JSON column, as existing rows are
+                    row['further_links'] = dump_json(extract_links(item))
+                elif key == 'ansprechpunkt':
+                    populate_contact_info(item, row)
+                elif key in LABEL_COLUMNS:
+                    row[LABEL_COLUMNS[key]] = item.text().strip()
+                key = None
+        else:
+            # Extract text content for tabbed articles
+            row[TAB_COLUMNS[section]] = join_text(node)
 
-    # Extract HTML content for tabbed articles
-    for tab_id in ['tab1', 'tab2', 'tab3']:
-        article = soup.find('article', id=tab_id)
-        if article:
-            key = tab_id.replace('tab', '').replace('1', 'short_summary').replace('2', 'additional_information').replace('3', 'legal_basis')
-            details[f"{key}"] = article.get_text(separator="\n", strip=True)
+def scrape_program_details(html, program_name):
+    try:
+        row = {column: '' for column in DETAILS_ROW_COLUMNS}
+        row['further_links'] = dump_json([])
+        populate_details(LexborHTMLParser(html, encoding=True), row)
+        return row
+    except Exception as e:
+        logger.error(f"Error scraping program details for {program_name}: {e}")
+        return None
 
-    return details
+async def fetch_program_details(sem, limiter, http, program_url, program_name):
+    # Parse as soon as the page arrives so its raw HTML is not kept around for the whole index page
+    html = await fetch_detail(sem, limiter, http, program_url)
+    if html is None:
+        return None
+    return scrape_program_details(html, program_name)
 
-async def scrape_program_details(session, program, page):
-    try:
-        if program.is_scraped:
-            logger.info(f"Program already scraped: {program.program_name}")
-            return
+def save_program_details(session, details_rows):
+    program_ids = [row['program_id'] for row in details_rows]
 
-        soup = await get_soup_with_js(page, program.program_url)
-        if not soup:
-            return
+    # Programs that already have a details row get it updated in place
+    existing = dict(session.execute(
+        select(ProgramDetails.program_id, ProgramDetails.id).where(ProgramDetails.program_id.in_(program_ids))
+    ).all())
+    new_rows = [row for row in details_rows if row['program_id'] not in existing]
+    updated_rows = [{**row, 'id': existing[row['program_id']]} for row in details_rows if row['program_id'] in existing]
 
-        details = extract_program_details(soup)
+    if new_rows:
+        session.execute(insert(ProgramDetails.__table__), new_rows)
+    if updated_rows:
+        session.execute(update(ProgramDetails), updated_rows)
+    session.execute(update(FundingProgram).where(FundingProgram.id.in_(program_ids)).values(is_scraped=True))
+
+def create_http_session():
+    connector = aiohttp.TCPConnector(limit=2 * MAX_CONCURRENT_REQUESTS, limit_per_host=MAX_CONCURRENT_REQUESTS)
+    return aiohttp.ClientSession(connector=connector, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=30))
+
+async def produce_index_pages(queue, workers):
+    try:
+        current_url = START_URL
+        while current_url:
+            logger.info(f"Scraping page: {current_url}")
+            # Fetch in a thread so detail pages of earlier index pages keep downloading meanwhile
+            tree = await asyncio.to_thread(get_soup, current_url)
+            if not tree:
+                return False
+
+            await queue.put((current_url, extract_program_links(tree)))
+            current_url = get_next_page_url(tree)
+        return True
+    finally:
+        for _ in range(workers):
+            await queue.put(None)
 
-        # Check if program details already exist
-        if program.details:
-            logger.info(f"Updating existing details for program: {program.program_name}")
-            program_details = program.details
+async def consume_index_pages(queue, process_page):
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        page_url, programs = item
+        await process_page(page_url, programs)
+
+async def run_index_pipeline(process_page):
+    # The bounded queue keeps the producer at most a couple of index pages ahead of the workers
+    queue = asyncio.Queue(maxsize=INDEX_QUEUE_SIZE)
+    # Returns whether every index page could be fetched
+    completed, *_ = await asyncio.gather(
+        produce_index_pages(queue, INDEX_PAGE_WORKERS),
+        *(consume_index_pages(queue, process_page) for _ in range(INDEX_PAGE_WORKERS)),
+    )
+    return completed
+
+async def scrape_index_page(session, url_to_id, scraped_ids, sem, limiter, http, page_url, programs):
+    # Keyed by program id, so a program linked twice on the page is only scraped once
+    pending = {}
+    new_programs = []
+    for program_url, program_name in programs:
+        program_id = url_to_id.get(program_url)
+        if program_id is None:
+            new_programs.append({'program_url': program_url, 'program_name': program_name})
+        elif program_id in scraped_ids:
+            logger.info(f"Program already scraped: {program_name}")
         else:
-            logger.info(f"Creating new details for program: {program.program_name}")
-            program_details = ProgramDetails(program=program)
-
-        # Update program details
-        program_details.funding_type = details.get('förderart', '')
-        program_details.support_area = details.get('förderbereich', '')
-        program_details.funding_area = details.get('fördergebiet', '')
-        program_details.eligible = details.get('förderberechtigte', '')
-        program_details.funding_provider = details.get('fördergeber', '')
-        program_details.provider_name = details.get('provider_name', '')
-        program_details.provider_address = details.get('provider_address', '')
-        program_details.provider_phone = details.get('provider_phone', '')
-        program_details.provider_fax = details.get('provider_fax', '')
-        program_details.provider_email = details.get('provider_email', '')
-        program_details.provider_website = details.get('provider_website', '')
-        program_details.further_links = json.dumps(details.get('weiterführende_links', []))
-        program_details.short_summary = details.get('short_summary', '')
-        program_details.additional_information = details.get('additional_information', '')
-        program_details.legal_basis = details.get('legal_basis', '')
-
-        session.add(program_details)
-        program.is_scraped = True
+            pending.setdefault(program_id, (program_url, program_name))
+
+    # Workers share the session, so no transaction is left open across an await
+    try:
+        if new_programs:
+            session.execute(insert(FundingProgram.__table__).prefix_with('IGNORE'), new_programs)
+
+            # MySQL has no INSERT ... RETURNING, so look the new ids up once for the whole batch
+            new_names = {row['program_url']: row['program_name'] for row in new_programs}
+            new_ids = dict(session.execute(
+                select(FundingProgram.program_url, FundingProgram.id).where(FundingProgram.program_url.in_(list(new_names)))
+            ).all())
+            session.commit()
+            url_to_id.update(new_ids)
+            for program_url, program_id in new_ids.items():
+                pending.setdefault(program_id, (program_url, new_names[program_url]))
+            logger.info(f"Added {len(new_programs)} new programs")
+
+        # Fetch and parse all detail pages of this index page concurrently
+        rows = await asyncio.gather(*(
+            fetch_program_details(sem, limiter, http, program_url, program_name)
+            for program_url, program_name in pending.values()
+        ))
+
+        details_rows = []
+        for program_id, row in zip(pending, rows):
+            if row:
+                details_rows.append({'program_id': program_id, **row})
+
+        if details_rows:
+            save_program_details(session, details_rows)
         session.commit()
-        logger.info(f"Successfully scraped and saved details for program: {program.program_name}")
+        scraped_ids.update(row['program_id'] for row in details_rows)
+        logger.info(f"Successfully scraped and saved details for {len(details_rows)} programs")
     except Exception as e:
-        logger.error(f"Error scraping program details: {e}")
+        logger.error(f"Error saving programs from page {page_url}: {e}")
+        session.rollback()
+
 async def scrape_funding_programs():
-    browser = await get_browser()
-    page = await browser.newPage()
     session = Session()
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    limiter = AsyncLimiter(REQUESTS_PER_SECOND, 1)
 
     try:
-        current_url = START_URL
-        while current_url:
-            logger.info(f"Scraping page: {current_url}")
-            soup = get_soup(current_url)  # Use requests for the main page
-            if not soup:
-                break
-
-            programs = extract_program_links(soup)
-            for program_url, program_name in programs:
-                program = session.query(FundingProgram).filter_by(program_url=program_url).first()
-                if not program:
-                    program = FundingProgram(program_url=program_url, program_name=program_name)
-                    session.add(program)
-                    session.commit()
-                    logger.info(f"Added new program: {program_name}")
-
-                try:
-                    await scrape_program_details(session, program, page)
-                except Exception as e:
-                    logger.error(f"Error scraping program {program_name}: {e}")
-                    session.rollback()
-
-            current_url = get_next_page_url(soup)
-            await asyncio.sleep(1)  # Be polite to the server
+        # Load all known programs once and keep the URL to id map up to date in memory
+        url_to_id = {}
+        scraped_ids = set()
+        for program_id, program_url, is_scraped in session.execute(
+            select(FundingProgram.id, FundingProgram.program_url, FundingProgram.is_scraped)
+        ):
+            url_to_id[program_url] = program_id
+            if is_scraped:
+                scraped_ids.add(program_id)
+
+        async with create_http_session() as http:
+            await run_index_pipeline(functools.partial(scrape_index_page, session, url_to_id, scraped_ids, sem, limiter, http))
 
     finally:
         session.close()
-        await browser.close()
         logger.info("Finished scraping all funding programs")
 
 def reset_database():
-    session = Session()
     try:
-        # Delete all records from program_details table
-        session.query(ProgramDetails).delete()
-        session.query(FundingProgram).delete()
+        with engine.begin() as conn:
+            # TRUNCATE refuses tables referenced by a foreign key, even when the referencing table is empty
+            conn.exec_driver_sql("SET FOREIGN_KEY_CHECKS=0")
+            try:
+                conn.exec_driver_sql(f"TRUNCATE TABLE {ProgramDetails.__tablename__}")
+                conn.exec_driver_sql(f"TRUNCATE TABLE {FundingProgram.__tablename__}")
+            finally:
+                conn.exec_driver_sql("SET FOREIGN_KEY_CHECKS=1")
         logger.info("Deleted all records from database.")
-
-        session.commit()
         logger.info("Database reset completed successfully")
     except Exception as e:
-        session.rollback()
         logger.error(f"Error resetting database: {e}")
+
+async def collect_index_page(sem, limiter, http, programs, details_rows, page_url, page_programs):
+    # A program can show up on two index pages if the pagination shifts during the crawl
+    page_programs = {program_url: program_name for program_url, program_name in page_programs if program_url not in programs}
+    programs.update(page_programs)
+
+    rows = await asyncio.gather(*(
+        fetch_program_details(sem, limiter, http, program_url, program_name)
+        for program_url, program_name in page_programs.items()
+    ))
+    for program_url, row in zip(page_programs, rows):
+        if row:
+            details_rows[program_url] = row
+
+async def scrape_all_programs():
+    programs = {}
+    details_rows = {}
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    limiter = AsyncLimiter(REQUESTS_PER_SECOND, 1)
+
+    async with create_http_session() as http:
+        completed = await run_index_pipeline(functools.partial(collect_index_page, sem, limiter, http, programs, details_rows))
+
+    return completed, programs, details_rows
+
+def to_tsv_field(value):
+    # Escape the characters LOAD DATA treats specially with its default ESCAPED BY '\\'
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+def write_tsv(rows):
+    with tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8', newline='', delete=False) as f:
+        for row in rows:
+            f.write('\t'.join(to_tsv_field(value) for value in row))
+            f.write('\n')
+    return f.name
+
+def load_data_infile(cursor, path, table, columns):
+    cursor.execute(
+        f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+        f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+        (path,)
+    )
+
+def reset_and_bulk_load():
+    completed, programs, details_rows = asyncio.get_event_loop().run_until_complete(scrape_all_programs())
+    if not completed or not programs:
+        # Replacing the tables with an incomplete crawl would lose programs, so leave the database as it is
+        raise RuntimeError(f"Crawl incomplete ({len(programs)} programs scraped), database left unchanged")
+    logger.info(f"Scraped {len(programs)} programs and {len(details_rows)} program details, loading into database")
+
+    # Only programs whose details were saved count as scraped, the others are retried by the regular scraper
+    programs_path = write_tsv(
+        (program_url, program_name, int(program_url in details_rows)) for program_url, program_name in programs.items()
+    )
+    details_path = write_tsv(
+        [program_url] + [dump_json(row[c]) if c == 'further_links' else row[c] for c in DETAILS_ROW_COLUMNS]
+        for program_url, row in details_rows.items()
+    )
+
+    # LOAD DATA LOCAL INFILE has to be enabled on the client as well as on the server (local_infile=ON)
+    bulk_engine = create_engine(DATABASE_URL, connect_args={'allow_local_infile': True})
+    connection = None
+    try:
+        connection = bulk_engine.raw_connection()
+        cursor = connection.cursor()
+        cursor.execute("SELECT @@GLOBAL.local_infile")
+        if not cursor.fetchone()[0]:
+            raise RuntimeError("LOAD DATA LOCAL INFILE is disabled on the MySQL server (local_infile=OFF)")
+
+        # Load into staging tables first; programs are matched to their details by URL
+        cursor.execute("CREATE TEMPORARY TABLE funding_programs_staging LIKE funding_programs")
+        cursor.execute("CREATE TEMPORARY TABLE program_details_staging LIKE program_details")
+        cursor.execute("ALTER TABLE program_details_staging ADD COLUMN program_url VARCHAR(255)")
+        load_data_infile(cursor, programs_path, 'funding_programs_staging', ['program_url', 'program_name', 'is_scraped'])
+        load_data_infile(cursor, details_path, 'program_details_staging', ['program_url'] + DETAILS_ROW_COLUMNS)
+
+        # Replace the live data in one transaction, so a failure rolls back to the previous contents
+        cursor.execute("DELETE FROM program_details")
+        cursor.execute("DELETE FROM funding_programs")
+        cursor.execute(
+            "INSERT INTO funding_programs (program_url, program_name, is_scraped) "
+            "SELECT program_url, program_name, is_scraped FROM funding_programs_staging"
+        )
+        cursor.execute(
+            f"INSERT INTO program_details (program_id, {', '.join(DETAILS_ROW_COLUMNS)}) "
+            f"SELECT fp.id, {', '.join('s.' + c for c in DETAILS_ROW_COLUMNS)} FROM program_details_staging s "
+            f"JOIN funding_programs fp ON fp.program_url = s.program_url"
+        )
+        connection.commit()
+        logger.info("Bulk load completed successfully")
+    except Exception as e:
+        if connection is not None:
+            connection.rollback()
+        logger.error(f"Error bulk loading database: {e}")
+        raise
     finally:
-        session.close()
+        if connection is not None:
+            connection.close()
+        # Closes the pooled connection, which also drops the temporary staging tables
+        bulk_engine.dispose()
+        os.remove(programs_path)
+        os.remove(details_path)
 
 def verify_database():
     session = Session()
     try:
-        programs = session.query(FundingProgram).all()
-        logger.info(f"Total programs in database: {len(programs)}")
+        total_programs = session.scalar(select(func.count(FundingProgram.id)))
+        logger.info(f"Total programs in database: {total_programs}")
 
-        programs_with_details = session.query(FundingProgram).filter(FundingProgram.details != None).count()
+        programs_with_details = session.scalar(select(func.count()).select_from(FundingProgram).join(ProgramDetails))
         logger.info(f"Programs with details: {programs_with_details}")
 
-        sample_program = session.query(FundingProgram).filter(FundingProgram.details != None).first()
+        sample_program = session.scalars(select(FundingProgram).join(ProgramDetails).limit(1)).first()
         if sample_program:
             logger.info(f"Sample program: {sample_program.program_name}")
             logger.info(f"Sample details:")
@@ -322,26 +552,34 @@ def verify_database():
 def run_scraper():
     asyncio.get_event_loop().run_until_complete(scrape_funding_programs())
 
+def next_monday_at(run_time):
+    now = datetime.datetime.now()
+    next_run = datetime.datetime.combine(now.date(), run_time)
+    next_run += datetime.timedelta(days=-next_run.weekday() % 7)
+    if next_run <= now:
+        next_run += datetime.timedelta(days=7)
+    return next_run
+
 def schedule_scraper():
     # Run the scraper immediately
     logger.info("Running scraper immediately...")
     run_scraper()
 
-    # Get the current time
-    now = datetime.datetime.now()
-
-    # Schedule the next run for the same time next week
-    next_run = now + datetime.timedelta(days=7)
-    next_run_time = next_run.strftime("%H:%M")
-
-    schedule.every().monday.at(next_run_time).do(run_scraper)
+    # Schedule the following runs for the current time of day
+    run_time = datetime.datetime.now().time().replace(second=0, microsecond=0)
 
-    logger.info(f"Scraper scheduled to run every Monday at {next_run_time}. Press Ctrl+C to exit.")
+    logger.info(f"Scraper scheduled to run every Monday at {run_time:%H:%M}. Press Ctrl+C to exit.")
 
     try:
         while True:
-            schedule.run_pending()
-            time.sleep(1)
+            next_run = next_monday_at(run_time)
+            logger.info(f"Next run at {next_run:%Y-%m-%d %H:%M}")
+
+            # Sleep in chunks of at most an hour and re-read the wall clock each time,
+            # so DST changes and host suspends don't shift the run
+            while (delay := (next_run - datetime.datetime.now()).total_seconds()) > 0:
+                time.sleep(min(delay, MAX_SCHEDULER_SLEEP))
+            run_scraper()
     except KeyboardInterrupt:
         logger.info("Scheduler stopped by user")
 
@@ -350,10 +588,13 @@ if __name__ == "__main__":
     parser.add_argument("--reset", action="store_true", help="Reset the database")
     parser.add_argument("--verify", action="store_true", help="Verify database contents")
     parser.add_argument("--schedule", action="store_true", help="Run the scraper on a weekly schedule")
+    parser.add_argument("--bulk-load", action="store_true", help="Replace the database contents with a fresh crawl loaded via LOAD DATA LOCAL INFILE")
     args = parser.parse_args()
 
     if args.reset:
         reset_database()
+    elif args.bulk_load:
+        reset_and_bulk_load()
     elif args.verify:
         verify_database()
     elif args.schedule: